@@ -1,24 +1,82 @@
+import functools
 import os
-from flask import Flask, request, jsonify
 
+# Cooperative I/O for the gevent worker, e.g.
+#   GEVENT=1 gunicorn -k gevent -w 4 --worker-connections 1000 -b 0.0.0.0:5000 app:app
+# Must run before anything else imports socket/ssl.
+if os.getenv("GEVENT") == "1":
+    from gevent import monkey
+    monkey.patch_all()
+
+import orjson
+from flask import Flask, request, jsonify, Response, stream_with_context
+from flask.json.provider import JSONProvider
+
+import httpx
 from google import genai
-from google.genai.types import Part, FileData
+from google.genai.types import HttpOptions, Part, FileData
 import google.genai.errors as genai_errors
 
+
+class OrjsonProvider(JSONProvider):
+    """Route request.json and jsonify through orjson instead of stdlib json."""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 
 # ------------------------------
 # Gemini client setup
 # ------------------------------
-client = genai.Client(api_key=os.getenv("GEMINI_API_KEY"))
+# One pooled HTTP/2 httpx client shared by every request so concurrent calls
+# multiplex over warm connections instead of re-handshaking per call.
+http_client = httpx.Client(
+    transport=httpx.HTTPTransport(
+        http2=True,
+        retries=2,
+        limits=httpx.Limits(max_keepalive_connections=50, max_connections=200),
+    ),
+)
+client = genai.Client(
+    api_key=os.getenv("GEMINI_API_KEY"),
+    # The SDK passes its own per-request timeout (milliseconds) to httpx,
+    # overriding any default set on http_client.
+    http_options=HttpOptions(httpx_client=http_client, timeout=60_000),
+)
 # OR: client = genai.Client(api_key=os.environ["GEMINI_API_KEY"])
 
+
+def json_body(*required):
+    """Parse the JSON object body once and pass it to the view, 400 if any
+    of the ``required`` keys is missing or not a non-blank string."""
+    def deco(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            data = request.get_json(silent=True)
+            if not isinstance(data, dict):
+                return jsonify({"error": "Request body must be a JSON object"}), 400
+            missing = [
+                k for k in required
+                if not isinstance(data.get(k), str) or not data[k].strip()
+            ]
+            if missing:
+                return jsonify({"error": f"Missing field(s): {', '.join(missing)}"}), 400
+            return fn(data, *args, **kwargs)
+        return wrapper
+    return deco
+
+
 @app.route('/ask', methods=['POST'])
-def ask():
+@json_body("prompt")
+def ask(data):
+    prompt = data["prompt"]
     try:
-        data = request.json
-        prompt = data.get("prompt", "")
-
         response = client.models.generate_content(
             model="gemini-1.5-flash",
             contents=prompt
@@ -26,16 +84,45 @@ def ask():
 
         return jsonify({"response": response.text})
 
-    except genai_errors.GenAiException as e:
-        return jsonify({"error": str(e)}), 500
+    except genai_errors.APIError as e:
+        # Surface quota exhaustion as 429 so clients can back off.
+        return jsonify({"error": str(e)}), 429 if e.code == 429 else 500
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
+def _sse(text, event=None):
+    # Every line of a multi-line payload needs its own "data:" prefix.
+    head = f"event: {event}\n" if event else ""
+    return head + "".join(f"data: {line}\n" for line in text.split("\n")) + "\n"
+
+
+@app.route('/ask/stream', methods=['POST'])
+@json_body("prompt")
+def ask_stream(data):
+    prompt = data["prompt"]
+
+    def generate():
+        try:
+            for chunk in client.models.generate_content_stream(
+                model="gemini-1.5-flash",
+                contents=prompt
+            ):
+                if chunk.text:
+                    yield _sse(chunk.text)
+        except Exception as e:
+            yield _sse(str(e), event="error")
+
+    return Response(stream_with_context(generate()), mimetype="text/event-stream")
+
+
 @app.route('/', methods=['GET'])
 def home():
     return "Gemini API is working!"
 
+# Local development only. The dev server blocks a thread for the whole
+# Gemini call; in production run under gunicorn with the gevent worker
+# (see the command at the top of this file).
 if __name__ == '__main__':
     app.run(debug=True)